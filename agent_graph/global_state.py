@@ -1,48 +1,163 @@
 import os
+import uuid
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
+import numpy as np
+import chromadb
+from chromadb.config import Settings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_mistralai import MistralAIEmbeddings
 
+from utils.cache import TTLCache, SemanticCache
+
+# Chroma inserts are most efficient in batches of a few hundred documents
+ADD_BATCH_SIZE = 200
+# Texts per Mistral embedding request
+EMBED_BATCH_SIZE = 128
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that memoizes vectors by the SHA-256 of each text
+    Vectors are stored as float32 arrays, about an eighth of the memory of a list of floats
+    """
+
+    def __init__(self, base: Embeddings, maxsize: int = 4096, ttl: float = 3600):
+        self.base = base
+        self._documents = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._queries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed only the texts that are not already cached, each distinct text once"""
+        keys = [_text_key(text) for text in texts]
+        vectors = {}
+        for key in keys:
+            if key not in vectors:
+                cached = self._documents.get(key)
+                if cached is not None:
+                    vectors[key] = cached
+
+        # Repeated chunks (shared boilerplate, duplicate pages) are sent to the API only once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+
+        if missing:
+            fresh = self.base.embed_documents(list(missing.values()))
+            for key, vector in zip(missing, fresh):
+                vectors[key] = np.asarray(vector, dtype=np.float32)
+                self._documents.set(key, vectors[key])
+
+        return [vectors[key].tolist() for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = _text_key(text)
+        vector = self._queries.get(key)
+        if vector is None:
+            vector = np.asarray(self.base.embed_query(text), dtype=np.float32)
+            self._queries.set(key, vector)
+        return vector.tolist()
+
+
 class GlobalState:
     """Singleton for managing ChromaDB vector store across the session"""
 
     _instance = None
     _vectorstore = None
+    _embeddings = None
+    _client = None
+    _search_cache = None
+    _doc_count = 0
+    _count_synced = False
+
+    _lock = threading.Lock()
 
     def __new__(cls):
+        # Double-checked locking: only the first construction pays for the lock
         if cls._instance is None:
-            cls._instance = super(GlobalState, cls).__new__(cls)
-            cls._instance._initialize_vectorstore()
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(GlobalState, cls).__new__(cls)
+                    # Serializes writers sharing the one Chroma collection
+                    instance._write_lock = threading.Lock()
+                    # Near-identical queries reuse results; entries go stale as documents are added
+                    instance._search_cache = SemanticCache(
+                        maxsize=512, ttl=300, threshold=0.97,
+                        quantize=os.getenv("SEMANTIC_CACHE_FP32") != "1"
+                    )
+                    instance._initialize_vectorstore()
+                    cls._instance = instance
         return cls._instance
 
     def _initialize_vectorstore(self):
         """Initialize ChromaDB with Mistral embeddings"""
         if self._vectorstore is None:
             try:
-                embeddings = MistralAIEmbeddings(
-                    model="mistral-embed",
-                    mistral_api_key=os.getenv("MISTRAL_API_KEY")
-                )
+                # Kept across clear_vectorstore so repeated texts never hit the API twice
+                if self._embeddings is None:
+                    self._embeddings = CachedEmbeddings(MistralAIEmbeddings(
+                        model="mistral-embed",
+                        mistral_api_key=os.getenv("MISTRAL_API_KEY")
+                    ))
+                if self._client is None:
+                    self._client = self._create_client()
                 self._vectorstore = Chroma(
-                    embedding_function=embeddings,
+                    client=self._client,
+                    embedding_function=self._embeddings,
                     collection_name="research_docs"
                 )
+                # Tracked in memory so searches don't hit SQLite for a count
+                self._doc_count = 0
+                self._count_synced = False
             except Exception as e:
                 print(f"⚠️ Vector store init failed (Safe Fail): {e}")
                 self._vectorstore = None
 
+    @staticmethod
+    def _create_client():
+        """Chroma client with telemetry disabled; persisted only when CHROMA_PERSIST_DIR is set"""
+        settings = Settings(anonymized_telemetry=False)
+        persist_dir = os.getenv("CHROMA_PERSIST_DIR")
+        if persist_dir:
+            return chromadb.PersistentClient(path=persist_dir, settings=settings)
+        return chromadb.EphemeralClient(settings=settings)
+
     def add_documents(self, documents: List[Document]) -> bool:
         """Add documents to vector store"""
         if not documents:
             return False
             
         if self._vectorstore is None:
-            self._initialize_vectorstore()
+            with self._write_lock:
+                self._initialize_vectorstore()
 
         if self._vectorstore:
             try:
-                self._vectorstore.add_documents(documents)
+                # Embed up front so each batch is inserted with precomputed vectors;
+                # this is network-bound, so it runs outside the write lock
+                texts = [doc.page_content for doc in documents]
+                vectors = self._embed_documents(texts)
+
+                with self._write_lock:
+                    for i in range(0, len(documents), ADD_BATCH_SIZE):
+                        batch = documents[i:i + ADD_BATCH_SIZE]
+                        self._vectorstore._collection.add(
+                            ids=[str(uuid.uuid4()) for _ in batch],
+                            documents=texts[i:i + ADD_BATCH_SIZE],
+                            metadatas=[doc.metadata for doc in batch],
+                            embeddings=vectors[i:i + ADD_BATCH_SIZE]
+                        )
+                    self._doc_count += len(documents)
+                    self._search_cache.clear()
                 print(f"✅ Added {len(documents)} documents to DB")
                 return True
             except Exception as e:
@@ -50,6 +165,13 @@ class GlobalState:
                 return False
         return False
 
+    def _embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with one Mistral request per EMBED_BATCH_SIZE slice"""
+        vectors = []
+        for i in range(0, len(texts), EMBED_BATCH_SIZE):
+            vectors.extend(self._embeddings.embed_documents(texts[i:i + EMBED_BATCH_SIZE]))
+        return vectors
+
     def similarity_search(self, query: str, k: int = 5) -> List[Document]:
         """Perform similarity search safely"""
         if self._vectorstore is None:
@@ -60,24 +182,62 @@ class GlobalState:
 
         try:
             # GUARD: Check if collection is empty to prevent crash
-            if hasattr(self._vectorstore, '_collection') and self._vectorstore._collection.count() == 0:
+            if self.get_document_count() == 0:
                 print("⚠️ DB is empty, skipping search")
                 return []
 
-            results = self._vectorstore.similarity_search(query, k=k)
+            # Embed once and reuse the vector for both the cache lookup and the search
+            query_vector = self._embeddings.embed_query(query)
+            cached = self._search_cache.get(query_vector, scope=k)
+            if cached is not None:
+                return list(cached)
+
+            results = self._vectorstore.similarity_search_by_vector(query_vector, k=k)
+            self._search_cache.set(query_vector, results, scope=k)
             return results
         except Exception as e:
             print(f"⚠️ Search failed gracefully: {e}")
             return []
 
+    def similarity_search_many(self, queries: List[str], k: int = 5) -> List[Document]:
+        """
+        Search several phrasings of a question in parallel
+        Hits are interleaved by rank, deduplicated by source chunk and capped at k
+        """
+        if not queries:
+            return []
+        if len(queries) == 1:
+            return self.similarity_search(queries[0], k=k)
+
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            result_lists = list(pool.map(lambda q: self.similarity_search(q, k=k), queries))
+
+        merged = []
+        seen = set()
+        for rank in range(k):
+            for results in result_lists:
+                if rank >= len(results):
+                    continue
+                doc = results[rank]
+                key = (doc.metadata.get("source"), doc.metadata.get("chunk_index"), doc.page_content[:100])
+                if key in seen:
+                    continue
+                seen.add(key)
+                merged.append(doc)
+
+        return merged[:k]
+
     def clear_vectorstore(self):
         """Clear all documents safely"""
         if self._vectorstore:
             try:
-                self._vectorstore.delete_collection()
-                # Re-init immediately
-                self._vectorstore = None
-                self._initialize_vectorstore()
+                with self._write_lock:
+                    self._vectorstore.delete_collection()
+                    self._doc_count = 0
+                    self._search_cache.clear()
+                    # Re-init immediately
+                    self._vectorstore = None
+                    self._initialize_vectorstore()
                 print("🗑️ Vector store cleared")
             except Exception as e:
                 print(f"⚠️ Error clearing DB (Ignored): {e}")
@@ -86,13 +246,22 @@ class GlobalState:
         """Get number of documents in vector store safely"""
         if self._vectorstore is None:
             return 0
+        self._resync_count()
+        return self._doc_count
+
+    def _resync_count(self):
+        """Read the real collection count once, in case it was populated before init"""
+        if self._count_synced:
+            return
+        self._count_synced = True
+        if self._doc_count:
+            return
         try:
             # Safe access to private collection for counting
             if hasattr(self._vectorstore, '_collection'):
-                return self._vectorstore._collection.count()
-            return 0
+                self._doc_count = self._vectorstore._collection.count()
         except:
-            return 0
+            pass
 
 
     @property
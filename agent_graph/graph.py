@@ -1,10 +1,15 @@
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Optional
 from datetime import datetime
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 
+from utils.research_cache import ResearchCache
 from .states import AgentState
 from .nodes import AgentNodes
+from .global_state import get_global_state
+
+# Finished runs keyed by normalized query, so repeating a question skips search, scrape and LLM calls
+research_cache = ResearchCache()
 
 class ResearchGraph:
     """LangGraph implementation for the research agent"""
@@ -38,12 +43,7 @@ class ResearchGraph:
         # Add conditional edges from review
         def should_continue(state: AgentState) -> str:
             """Determine if the graph should continue or end"""
-            if state.get("report") and state["report"].strip():
-                return "end"
-            elif state["current_sub_topic_index"] >= len(state.get("sub_topics", [])):
-                return "research"  # Loop back to research more
-            else:
-                return "research"
+            return "end" if (state.get("report") or "").strip() else "research"
 
         workflow.add_conditional_edges(
             "review",
@@ -60,7 +60,14 @@ class ResearchGraph:
 
         return compiled_graph
 
-    def run_research(self, query: str, session_id: str = "default") -> Dict[str, Any]:
+    def run_research(self, query: str, session_id: str = "default",
+                     callbacks: Optional[List[Any]] = None,
+                     on_progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Run the full research graph for a query
+        Optional LangChain callbacks receive node and LLM events, including streamed report tokens;
+        on_progress is called with each node name and its state update as soon as that node finishes
+        """
 
         print(f"🚀 Starting research for: {query}")
 
@@ -86,9 +93,17 @@ class ResearchGraph:
         try:
             # Configure checkpointer with proper thread_id
             config = {"configurable": {"thread_id": session_id, "checkpoint_id": session_id}}
-
-            # Run the graph
-            result = self.graph.invoke(initial_state, config=config)
+            if callbacks:
+                config["callbacks"] = callbacks
+
+            # Stream the graph so progress can be reported per node instead of only at the end
+            result = initial_state
+            for mode, chunk in self.graph.stream(initial_state, config=config, stream_mode=["updates", "values"]):
+                if mode == "values":
+                    result = chunk
+                elif on_progress:
+                    for node_name, update in chunk.items():
+                        on_progress(node_name, update or {})
 
             print("✅ Research completed successfully!")
 
@@ -101,7 +116,8 @@ class ResearchGraph:
                     "loop_count": result.get("loop_count", 0),
                     "documents_count": len(result.get("documents", [])),
                     "session_id": session_id
-                }
+                },
+                "documents": result.get("documents", [])
             }
 
         except Exception as e:
@@ -126,7 +142,26 @@ graph TD
         """
 
 # Main execution function
-def run_research_agent(query: str, session_id: str = "default") -> Dict[str, Any]:
+def run_research_agent(query: str, session_id: str = "default",
+                       callbacks: Optional[List[Any]] = None,
+                       on_progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
     """Main function to run the research agent"""
+
+    cached = research_cache.get(query)
+    if cached is not None:
+        print(f"♻️ Reusing cached research for: {query}")
+        # Repopulate the vector store so follow-up chat has the same sources
+        get_global_state().add_documents(cached["docs"])
+        return {
+            "success": True,
+            "report": cached["report"],
+            "metadata": {**cached["metadata"], "session_id": session_id, "cached": True},
+            "documents": cached["docs"]
+        }
+
     graph = ResearchGraph()
-    return graph.run_research(query, session_id)
\ No newline at end of file
+    result = graph.run_research(query, session_id, callbacks, on_progress)
+    # Runs that gathered no sources (search or scrape outages, bad keys) must not stick to the query
+    if result.get("success") and result.get("documents"):
+        research_cache.set(query, result["report"], result["metadata"], result["documents"])
+    return result
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 import json
+import hashlib
 from typing import List, Dict, Optional
 from datetime import datetime
 from dotenv import load_dotenv
@@ -10,12 +11,32 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from tools.search import SearchTool
 from tools.scraper import ScraperTool
+from utils.cache import TTLCache
 
 from .global_state import get_global_state
 from .states import AgentState
 
 load_dotenv()
 
+# Sub-topic plans keyed by normalized query; the planner runs at temperature 0
+_plan_cache = TTLCache(maxsize=1024, ttl=None)
+
+
+# Built once per process instead of per AgentNodes; the separators are plain
+# literals that are valid regexes, so they are used as-is without re-escaping
+_DEFAULT_SPLITTER = RecursiveCharacterTextSplitter(
+    chunk_size=1000,
+    chunk_overlap=200,
+    length_function=len,
+    separators=["\n\n", "\n", " ", ""],
+    is_separator_regex=True
+)
+
+
+def _plan_key(query: str) -> str:
+    return hashlib.sha256(query.strip().lower().encode("utf-8")).hexdigest()
+
+
 class AgentNodes:
     """Node functions for the LangGraph agent"""
 
@@ -31,18 +52,21 @@ class AgentNodes:
         self.search_tool = SearchTool()
         self.scraper_tool = ScraperTool()
         
-        # 3. Initialize Text Splitter (With the Network Bug fix included)
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len, 
-            separators=["\n\n", "\n", " ", ""]
-        )
+        # 3. Shared Text Splitter (With the Network Bug fix included)
+        self.text_splitter = _DEFAULT_SPLITTER
 
     def plan_node(self, state: AgentState) -> AgentState:
         """Break down query into sub-topics"""
         print("🎯 Planning node: Breaking down query into sub-topics")
 
+        plan_key = _plan_key(state["query"])
+        cached_plan = _plan_cache.get(plan_key)
+        if cached_plan is not None:
+            state["sub_topics"] = list(cached_plan)
+            state["current_sub_topic_index"] = 0
+            print(f"📋 Plan reused from cache: {cached_plan}")
+            return state
+
         system_prompt = """You are a research planning expert. Break down the user's query into 3-5 specific sub-topics that need to be researched.
 
 Before answering, think: "What are the key aspects of this topic that need separate investigation?"
@@ -59,7 +83,10 @@ Return only a JSON array of sub-topics, nothing else."""
 
         try:
             sub_topics = json.loads(result.content.strip())
-            if not isinstance(sub_topics, list):
+            # Only a usable plan is cached; an empty or malformed one would stick for the process lifetime
+            if isinstance(sub_topics, list) and sub_topics and all(isinstance(t, str) for t in sub_topics):
+                _plan_cache.set(plan_key, list(sub_topics))
+            else:
                 sub_topics = [state["query"]]  # Fallback
         except:
             sub_topics = [state["query"]]  # Fallback
@@ -109,11 +136,17 @@ Return only a JSON array of sub-topics, nothing else."""
         global_state = get_global_state()
         
         scraped_content = []
+        all_docs: List[Document] = []
+
+        if not state["current_urls"]:
+            state["scraped_content"] = scraped_content
+            return state
 
-        for url in state["current_urls"]:
+        topic = state["sub_topics"][state["current_sub_topic_index"]]
+
+        # Scrapes run concurrently; split and store each page on this thread as it finishes
+        for url, result in self.scraper_tool.scrape_many(state["current_urls"], topic):
             try:
-                print(f"🌐 Scraping: {url}")
-                result = self.scraper_tool.scrape(url, state["sub_topics"][state["current_sub_topic_index"]])
                 scraped_content.append(result)
 
                 # Add successful scrapes to ChromaDB
@@ -133,11 +166,11 @@ Return only a JSON array of sub-topics, nothing else."""
                         for i, chunk in enumerate(chunks)
                     ]
 
-                    global_state.add_documents(documents)
+                    all_docs.extend(documents)
                     state["urls_scraped"] += 1
                     state["documents"].extend(documents)
 
-                    print(f"✅ Added {len(documents)} chunks to ChromaDB")
+                    print(f"✅ Prepared {len(documents)} chunks from {url}")
 
                 elif result["status"] in ["error", "timeout", "minimal"]:
                     print(f"⚠️  Using fallback for {url}: {result['status']}")
@@ -146,6 +179,10 @@ Return only a JSON array of sub-topics, nothing else."""
                 print(f"❌ Error scraping {url}: {e}")
                 continue
 
+        # One batched vector-store write per node instead of one per URL
+        if global_state.add_documents(all_docs):
+            print(f"✅ Added {len(all_docs)} chunks to ChromaDB")
+
         state["scraped_content"] = scraped_content
         return state
 
@@ -193,13 +230,18 @@ Write a comprehensive research report:
         ])
 
         chain = prompt | self.llm
-        result = chain.invoke({
+
+        # Stream so callbacks see tokens as they are generated instead of one final blob
+        parts = []
+        for chunk in chain.stream({
             "query": state["query"],
             "sources": sources_text
-        })
+        }):
+            parts.append(chunk.content)
+        report_draft = "".join(parts)
 
-        state["report_draft"] = result.content
-        print(f"📄 Report draft created ({len(result.content)} characters)")
+        state["report_draft"] = report_draft
+        print(f"📄 Report draft created ({len(report_draft)} characters)")
 
         return state
 
@@ -234,10 +276,8 @@ Be objective and strict about quality."""
             state["report"] = state["report_draft"] + "\n\n*Note: Research was limited due to source availability.*"
             state["current_sub_topic_index"] = len(state["sub_topics"])
         else:
-            # Need more research - move to next sub-topic or re-search current one
-            state["current_sub_topic_index"] += 1
+            # Need more research - move to next sub-topic, wrapping back to the first
+            state["current_sub_topic_index"] = (state["current_sub_topic_index"] + 1) % max(1, len(state["sub_topics"]))
             state["loop_count"] += 1
-            if state["current_sub_topic_index"] >= len(state["sub_topics"]):
-                state["current_sub_topic_index"] = 0  # Loop back to first sub-topic
 
         return state
\ No newline at end of file
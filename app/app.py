@@ -5,9 +5,13 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import uuid
+import time
+import asyncio
 import chainlit as cl
 from typing import Dict, Any
 from dotenv import load_dotenv
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_mistralai import ChatMistralAI
 
 from agent_graph import run_research_agent
 from agent_graph.global_state import get_global_state, cleanup_global_state
@@ -20,6 +24,44 @@ load_dotenv()
 graph_generator = KnowledgeGraphGenerator()
 pdf_generator = PDFGenerator()
 
+# One chat client per process so every question reuses its HTTP connection pool
+CHAT_LLM = ChatMistralAI(
+    model="mistral-small-latest",
+    temperature=0,
+    mistral_api_key=os.getenv("MISTRAL_API_KEY")
+)
+
+# Follow-up Q&A prompt, built once; only context and question vary per message
+CHAT_SYSTEM_PROMPT = """You are an expert research assistant. Answer the user's question based ONLY on the provided research context.
+
+GUIDELINES:
+1. Be specific and detailed using the provided sources
+2. Always cite sources using [Source: Title] format
+3. If information isn't available, say so clearly
+4. Maintain technical accuracy
+5. Use clear, concise language
+
+Context from research:
+{context}"""
+
+CHAT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", CHAT_SYSTEM_PROMPT),
+    ("human", "Question: {question}\n\nBased on the research context provided above, please answer:")
+])
+
+# Streamed chat answers are pushed to the UI at most every this many characters or seconds
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_SECONDS = 0.1
+
+# Status shown once each graph node finishes, describing the stage that follows it
+PROGRESS_MESSAGES = {
+    "plan": "🔍 **Searching the web...**\n\n*Filtering quality sources and identifying relevant URLs...*",
+    "research": "🕷️ **Scraping sources...**\n\n*Extracting content from the selected URLs...*",
+    "scrape": "📝 **Writing comprehensive report...**\n\n*Creating detailed analysis with citations...*",
+    "write": "👁️ **Reviewing the report...**\n\n*Checking whether more research is needed...*",
+    "review": "🔄 **Digging deeper...**\n\n*Researching the next sub-topic...*"
+}
+
 @cl.on_chat_start
 async def on_chat_start():
     """Initialize a new research session"""
@@ -77,30 +119,30 @@ async def handle_research_mode(message: cl.Message, session_id: str):
     await status_msg.send()
 
     try:
-        # Initialize async callback handler for LangChain
-        async_callback = cl.AsyncLangchainCallbackHandler(
+        # The graph runs in a worker thread, so use the synchronous LangChain handler;
+        # it streams the report tokens from write_node into the UI as they arrive
+        callback = cl.LangchainCallbackHandler(
             stream_final_answer=False
         )
+        cl.user_session.set("callback", callback)
 
-        # Run research agent with callback
-        cl.user_session.set("callback", async_callback)
-
-        # Set content first, then update
-        status_msg.content = "🔍 **Searching the web...**\n\n*Filtering quality sources and identifying relevant URLs...*"
-        await status_msg.update()
+        def on_progress(node_name: str, update: Dict[str, Any]):
+            """Called from the worker thread as each graph node finishes"""
+            if node_name == "review" and update.get("report"):
+                return  # final review: the report is done, nothing deeper to dig into
+            content = PROGRESS_MESSAGES.get(node_name)
+            if content:
+                status_msg.content = content
+                cl.run_sync(status_msg.update())
 
-        # Run research
-        result = run_research_agent(query, session_id)
+        # Run research in a worker thread so the blocking HTTP/LLM calls don't stall the event loop
+        result = await cl.make_async(run_research_agent)(query, session_id, [callback], on_progress)
 
         if not result.get("success"):
             status_msg.content = f"❌ **Research failed:** {result.get('error', 'Unknown error')}"
             await status_msg.update()
             return
 
-        # Update status
-        status_msg.content = "📝 **Writing comprehensive report...**\n\n*Creating detailed analysis with citations...*"
-        await status_msg.update()
-
         report = result["report"]
         metadata = result["metadata"]
 
@@ -108,7 +150,8 @@ async def handle_research_mode(message: cl.Message, session_id: str):
         status_msg.content = (
             f"✅ **Research Complete!**\n\n"
             f"*Generated comprehensive report with {metadata.get('urls_scraped', 0)} sources scraped, "
-            f"{metadata.get('search_queries', 0)} search queries executed*\n\n"
+            f"{metadata.get('search_queries', 0)} search queries executed"
+            f"{' (reused from an earlier run of this query)' if metadata.get('cached') else ''}*\n\n"
             f"📊 **Report:**\n\n{report}"
         )
         await status_msg.update()
@@ -146,18 +189,26 @@ async def handle_research_mode(message: cl.Message, session_id: str):
         await pdf_msg.send()
 
         try:
-            pdf_path = pdf_generator.generate_pdf(report, session_id, f"Research Report - {query[:50]}")
+            # Render in the PDF worker pool so other sessions keep being served meanwhile;
+            # long reports are split into parts that render in parallel
+            futures = pdf_generator.submit_paginated_pdf(report, session_id, f"Research Report - {query[:50]}")
+            results = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+            pdf_paths = [path for path in results if path]
 
-            if pdf_path:
+            if pdf_paths:
                 elements = [
                     cl.File(
-                        name="research_report.pdf",
+                        name="research_report.pdf" if len(results) == 1 else f"research_report_part{number}.pdf",
                         path=pdf_path,
                         display="inline"
                     )
+                    for number, pdf_path in enumerate(results, 1)
+                    if pdf_path
                 ]
 
                 pdf_msg.content = "📋 **PDF Report Generated!**\n\n*Download your complete research report with citations*"
+                if len(pdf_paths) < len(results):
+                    pdf_msg.content += f"\n\n⚠️ *{len(results) - len(pdf_paths)} of {len(results)} parts failed to render*"
                 pdf_msg.elements = elements
                 await pdf_msg.update()
             else:
@@ -169,6 +220,7 @@ async def handle_research_mode(message: cl.Message, session_id: str):
             await pdf_msg.update()
 
         # Switch to chat mode
+        cl.user_session.set("research_query", query)
         cl.user_session.set("research_complete", True)
         cl.user_session.set("mode", "chat")
 
@@ -213,8 +265,13 @@ async def handle_chat_mode(message: cl.Message, session_id: str):
             await status_msg.update()
             return
 
-        # Search for relevant documents
-        relevant_docs = global_state.similarity_search(query, k=5)
+        # Search the raw question and the question framed by the original research topic,
+        # off the event loop and in parallel
+        search_queries = [query]
+        research_query = cl.user_session.get("research_query")
+        if research_query:
+            search_queries.append(f"{research_query}: {query}")
+        relevant_docs = await asyncio.to_thread(global_state.similarity_search_many, search_queries, 5)
 
         if not relevant_docs:
             status_msg.content = "🔍 **No relevant information found**\n\n*Try rephrasing your question or ask about specific aspects of the research.*"
@@ -236,45 +293,26 @@ async def handle_chat_mode(message: cl.Message, session_id: str):
         context = "\n\n---\n\n".join(context_parts)
         sources_list = "\n".join(f"• {source}" for source in sources)
 
-        # Create follow-up prompt
-        system_prompt = """You are an expert research assistant. Answer the user's question based ONLY on the provided research context.
-
-GUIDELINES:
-1. Be specific and detailed using the provided sources
-2. Always cite sources using [Source: Title] format
-3. If information isn't available, say so clearly
-4. Maintain technical accuracy
-5. Use clear, concise language
+        # Per-message callbacks are bound to the chain; the client itself is shared
+        chain = (CHAT_PROMPT | CHAT_LLM).with_config({"callbacks": [callback]})
 
-Context from research:
-{context}"""
-
-        # Query the model
-        from langchain.prompts import ChatPromptTemplate
-        from langchain_mistralai import ChatMistralAI
-        
-        # Re-initialize LLM for chat to ensure fresh context
-        chat_llm = ChatMistralAI(
-            model="mistral-small-latest",
-            temperature=0,
-            mistral_api_key=os.getenv("MISTRAL_API_KEY"),
-            callbacks=[callback]
-        )
-
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("human", "Question: {question}\n\nBased on the research context provided above, please answer:")
-        ])
-
-        chain = prompt | chat_llm
-
-        # Generate answer
-        answer = await chain.ainvoke({
+        # Stream the answer, pushing batched updates instead of one WebSocket message per token
+        answer = ""
+        pending_chars = 0
+        last_flush = time.monotonic()
+        async for chunk in chain.astream({
             "context": context,
             "question": query
-        })
-
-        status_msg.content = f"💡 **Answer:**\n\n{answer.content}\n\n**Sources referenced:**\n{sources_list}"
+        }):
+            answer += chunk.content
+            pending_chars += len(chunk.content)
+            if pending_chars >= STREAM_FLUSH_CHARS or time.monotonic() - last_flush > STREAM_FLUSH_SECONDS:
+                status_msg.content = f"💡 **Answer:**\n\n{answer}"
+                await status_msg.update()
+                pending_chars = 0
+                last_flush = time.monotonic()
+
+        status_msg.content = f"💡 **Answer:**\n\n{answer}\n\n**Sources referenced:**\n{sources_list}"
         await status_msg.update()
 
     except Exception as e:
@@ -0,0 +1,32 @@
+import atexit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(pool_connections: int = 32, pool_maxsize: int = 32) -> requests.Session:
+    """
+    Create a pooled keep-alive session with retries on transient errors
+    Reusing one session per API host avoids a TCP+TLS handshake per call
+    """
+    retries = Retry(
+        total=3,
+        read=False,  # A read timeout means the POST may have been processed (and billed); never resend it
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=None  # Serper and Browserless are both POST APIs
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retries
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # Release pooled keep-alive sockets cleanly on interpreter shutdown
+    atexit.register(session.close)
+    return session
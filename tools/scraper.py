@@ -1,26 +1,247 @@
 import os
+import re
 import requests
-from typing import Optional
-from bs4 import BeautifulSoup
+from typing import Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from dotenv import load_dotenv
 
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # lxml fallback where the selectolax wheel is unavailable
+    HTMLParser = None
+    import lxml.html
+
+from .http_session import build_session
+from utils.cache import TTLCache
+
 load_dotenv()
 
+# Shared across ScraperTool instances so the Browserless connection stays warm between runs
+_browserless_session = build_session()
+
+# Cleaned page text by URL; Browserless bills per request and a render takes seconds
+_scrape_cache = TTLCache(maxsize=1024, ttl=86400)
+
+# Bounds concurrent Browserless renders across all ScraperTool instances
+MAX_CONCURRENT_SCRAPES = 8
+_scrape_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SCRAPES, thread_name_prefix="scraper")
+
+# Whole text blocks that are site chrome rather than page content; only short blocks are tested
+_BOILERPLATE_RE = re.compile(
+    r"(?:accept(?: all)?(?: cookies)?|we use cookies.*|subscribe(?: to our newsletter)?|sign (?:in|up)|log ?in"
+    r"|read more|share(?: this| on \w+)?|follow us(?: on \w+)?|advertisement|skip to (?:main )?content"
+    r"|privacy policy|cookie policy|terms of (?:use|service)|(?:©|copyright)\s*(?:\d{4}|©).*|all rights reserved\.?)",
+    re.IGNORECASE
+)
+# Longer blocks are real prose even when they start like boilerplate
+_BOILERPLATE_MAX_LEN = 60
+# Horizontal whitespace only, so line (block) boundaries survive the collapse
+_INLINE_WS_RE = re.compile(r"[^\S\n]+")
+# Source line breaks are layout only; block-level tags get a newline so each block becomes one line
+_SOURCE_NEWLINE_RE = re.compile(rb"[\r\n]+")
+_BLOCK_TAG_RE = re.compile(
+    rb"<(?=/?(?:p|div|li|ul|ol|dl|dt|dd|h[1-6]|br|hr|tr|td|th|table|section|article|main|blockquote|pre"
+    rb"|figure|figcaption|form|fieldset|details|summary|address)\b)",
+    re.IGNORECASE
+)
+# Tags whose contents are never page text
+_NON_CONTENT_TAGS = ["script", "style", "nav", "footer", "header", "aside", "iframe", "noscript", "svg"]
+
+# Only blocks this long are deduplicated, so short inline fragments are never dropped
+_DEDUPE_MIN_LEN = 40
+
+# Upper bound on page text kept per scrape
+MAX_CONTENT_CHARS = 20000
+# Text stored per cached URL; leaves each sub-topic room to pick its own MAX_CONTENT_CHARS
+# while bounding _scrape_cache to about maxsize * 100k characters
+SCRAPE_CACHE_MAX_CHARS = 5 * MAX_CONTENT_CHARS
+# Latin terminators need following whitespace; CJK terminators end a sentence on their own
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])\s*")
+# Unpunctuated runs (tables, lists, scripts without . ! ?) are ranked in pieces of at most this size
+_MAX_SENTENCE_CHARS = 1000
+_TERM_RE = re.compile(r"[a-z0-9]{3,}")
+
+# Pages whose extracted text is shorter than this are reported as minimal
+MIN_CONTENT_CHARS = 200
+
+# Raw-body checks run before parsing. Every UTF-8 character is at least one byte, so a body
+# smaller than MIN_CONTENT_CHARS bytes cannot pass the text-length check; noindex pages and
+# Cloudflare challenges are skipped as well since they carry no page content
+MIN_HTML_BYTES = MIN_CONTENT_CHARS
+_SNIFF_BYTES = 8192
+_NOINDEX_RE = re.compile(rb"<meta[^>]+name=[\"']?robots[\"']?[^>]+noindex", re.IGNORECASE)
+_INTERSTITIAL_MARKERS = (b"<title>Just a moment...</title>", b"cf-browser-verification")
+
+
+def is_unusable_html(raw: bytes) -> bool:
+    """True for tiny bodies, noindex pages and Cloudflare challenge pages"""
+    if len(raw) < MIN_HTML_BYTES:
+        return True
+    head = raw[:_SNIFF_BYTES]
+    return bool(_NOINDEX_RE.search(head)) or any(marker in head for marker in _INTERSTITIAL_MARKERS)
+
+
+def compress_text(text: str) -> str:
+    """
+    Shrink extracted page text before chunking and embedding
+    Expects one text block per line; collapses whitespace and drops
+    boilerplate blocks and blocks repeated elsewhere on the page
+    """
+    seen = set()
+    blocks = []
+    # One C-level pass over the whole page instead of a regex call per line
+    for line in _INLINE_WS_RE.sub(" ", text).split("\n"):
+        line = line.strip()
+        if not line or (len(line) <= _BOILERPLATE_MAX_LEN and _BOILERPLATE_RE.fullmatch(line)):
+            continue
+
+        # Menus, footers and cards often repeat the same block several times
+        if len(line) >= _DEDUPE_MIN_LEN:
+            key = line.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+
+        blocks.append(line)
+
+    return " ".join(blocks)
+
+
+def _split_long(sentence: str) -> List[str]:
+    """Cut an over-long sentence into pieces of at most _MAX_SENTENCE_CHARS, at spaces where possible"""
+    pieces = []
+    while len(sentence) > _MAX_SENTENCE_CHARS:
+        cut = sentence.rfind(" ", 0, _MAX_SENTENCE_CHARS + 1)
+        if cut <= 0:
+            cut = _MAX_SENTENCE_CHARS
+        pieces.append(sentence[:cut])
+        sentence = sentence[cut:].lstrip(" ")
+    if sentence:
+        pieces.append(sentence)
+    return pieces
+
+
+def extract_relevant(text: str, objective: str, max_chars: int = MAX_CONTENT_CHARS) -> str:
+    """
+    Extractive summary for pages longer than max_chars
+    Keeps the sentences sharing the most terms with the objective, in page order,
+    instead of cutting the page off after its first max_chars characters
+    """
+    if len(text) <= max_chars:
+        return text
+
+    objective_terms = set(_TERM_RE.findall(objective.lower()))
+    sentences = [piece for sentence in _SENTENCE_SPLIT_RE.split(text) for piece in _split_long(sentence)]
+
+    # Highest overlap first; ties keep page order so an unmatched objective degrades to truncation
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda i: (-len(objective_terms.intersection(_TERM_RE.findall(sentences[i].lower()))), i)
+    )
+
+    selected = []
+    budget = max_chars
+    for i in ranked:
+        cost = len(sentences[i]) + 1
+        if cost > budget:
+            continue
+        selected.append(i)
+        budget -= cost
+
+    if not selected:
+        return text[:max_chars]
+    return " ".join(sentences[i] for i in sorted(selected))[:max_chars]
+
+def parse_html(html: bytes, fallback_title: str) -> Tuple[str, str]:
+    """
+    Extract (title, body text) from raw HTML, one block-level element per line
+    Inline elements such as links stay inside their sentence
+    Uses selectolax's C parser, or lxml when selectolax is not installed
+    """
+    html = _BLOCK_TAG_RE.sub(b"\n<", _SOURCE_NEWLINE_RE.sub(b" ", html))
+
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        title_node = tree.css_first('title')
+        title_text = title_node.text(strip=True) if title_node else fallback_title
+
+        # Single pass over the tree for all non-content tags
+        tree.strip_tags(_NON_CONTENT_TAGS)
+        body_text = tree.body.text(separator='', strip=False) if tree.body else ''
+        return title_text, body_text
+
+    doc = lxml.html.fromstring(html)
+    title_node = doc.find('.//title')
+    title_text = title_node.text_content().strip() if title_node is not None else fallback_title
+    for element in doc.xpath('|'.join(f'//{tag}' for tag in _NON_CONTENT_TAGS)):
+        element.drop_tree()
+    body = doc.find('body')
+    body_text = body.text_content() if body is not None else ''
+    return title_text, body_text
+
+
 class ScraperTool:
     """Browserless.io scraper tool for web content extraction"""
 
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, max_bytes: int = 512 * 1024):
         self.api_key = os.getenv("BROWSERLESS_API_KEY")
         if not self.api_key:
             print("⚠️ Warning: BROWSERLESS_API_KEY not found")
 
+        self.session = session or _browserless_session
+        # HTML beyond this is never read; the kept text is capped at MAX_CONTENT_CHARS anyway
+        self.max_bytes = max_bytes
+
+    def _read_capped(self, response: requests.Response) -> bytes:
+        """Read a streamed response body, stopping once max_bytes have arrived"""
+        buf = bytearray()
+        for chunk in response.iter_content(chunk_size=65536):
+            buf.extend(chunk)
+            if len(buf) >= self.max_bytes:
+                break
+        return bytes(buf)
+
+    def scrape_many(self, urls: List[str], objective: str = "research") -> Iterator[Tuple[str, dict]]:
+        """
+        Scrape several URLs concurrently
+        Yields (url, result) pairs in completion order so callers can process early finishers
+        """
+        futures = {_scrape_pool.submit(self.scrape, url, objective): url for url in urls}
+
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                yield url, future.result()
+            except Exception as e:
+                print(f"❌ Scrape worker failed for {url}: {e}")
+                yield url, {
+                    "content": "Error: Technical issue scraping website.",
+                    "title": "Error",
+                    "url": url,
+                    "scraped_at": datetime.now().isoformat(),
+                    "status": "error"
+                }
+
     def scrape(self, url: str, objective: str = "research") -> Optional[dict]:
         """
         Scrape website content using Browserless /content endpoint
         """
         print(f"Scraping website: {url}")
 
+        # Cached text is stored before objective-specific trimming, so any sub-topic can reuse it
+        cached = _scrape_cache.get(url)
+        if cached is not None:
+            title_text, text, scraped_at = cached
+            print(f"♻️ Using cached content for {url}")
+            return {
+                "content": extract_relevant(text, objective),
+                "title": title_text,
+                "url": url,
+                "scraped_at": scraped_at,
+                "status": "success"
+            }
+
         if not self.api_key:
             return {
                 "content": "Error: Missing API Key",
@@ -45,50 +266,49 @@ class ScraperTool:
         }
 
         try:
-            response = requests.post(post_url, json=payload, timeout=45)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, "html.parser")
+            # Stream the body so oversized pages can be cut off early
+            with self.session.post(post_url, json=payload, timeout=45, stream=True) as response:
+                if response.status_code == 200:
+                    raw = self._read_capped(response)
 
-                # Extract title
-                title_tag = soup.find('title')
-                title_text = title_tag.get_text().strip() if title_tag else url
+                    if is_unusable_html(raw):
+                        title_text, text = url, ""
+                    else:
+                        # One block per line so boilerplate blocks can be filtered
+                        title_text, body_text = parse_html(raw, url)
+                        text = compress_text(body_text)
 
-                # Remove non-content tags
-                for element in soup(["script", "style", "nav", "footer", "header", "aside", "iframe", "noscript", "svg"]):
-                    element.extract()
+                    if len(text) < MIN_CONTENT_CHARS:
+                        return {
+                            "content": "Error: Content too short or blocked.",
+                            "title": title_text,
+                            "url": url,
+                            "scraped_at": datetime.now().isoformat(),
+                            "status": "minimal"
+                        }
 
-                # Get clean text
-                text = soup.get_text(separator=' ', strip=True)
+                    scraped_at = datetime.now().isoformat()
+                    _scrape_cache.set(url, (title_text, text[:SCRAPE_CACHE_MAX_CHARS], scraped_at))
 
-                if len(text) < 200:
                     return {
-                        "content": "Error: Content too short or blocked.",
+                        "content": extract_relevant(text, objective),
                         "title": title_text,
                         "url": url,
-                        "scraped_at": datetime.now().isoformat(),
-                        "status": "minimal"
+                        "scraped_at": scraped_at,
+                        "status": "success"
                     }
-
-                return {
-                    "content": text[:20000], 
-                    "title": title_text,
-                    "url": url,
-                    "scraped_at": datetime.now().isoformat(),
-                    "status": "success"
-                }
             
-            else:
-                # Safe error printing
-                error_msg = response.text[:100]
-                print(f"❌ Browserless error: {response.status_code} - {error_msg}")
-                return {
-                    "content": f"Error: Scrape failed with status {response.status_code}",
-                    "title": "Error",
-                    "url": url,
-                    "scraped_at": datetime.now().isoformat(),
-                    "status": "error"
-                }
+                else:
+                    # Safe error printing
+                    error_msg = response.text[:100]
+                    print(f"❌ Browserless error: {response.status_code} - {error_msg}")
+                    return {
+                        "content": f"Error: Scrape failed with status {response.status_code}",
+                        "title": "Error",
+                        "url": url,
+                        "scraped_at": datetime.now().isoformat(),
+                        "status": "error"
+                    }
 
         except Exception as e:
             # Sanitize error message to prevent API key leak
@@ -1,36 +1,63 @@
 import os
+import re
 import json
 import requests
-from typing import List, Dict
+from typing import List, Dict, Optional
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
+from .http_session import build_session
+from utils.cache import TTLCache
+
 load_dotenv()
 
+# Shared across SearchTool instances so the Serper connection stays warm between runs
+_serper_session = build_session()
+
+# Decoded organic results per (query, num_results); research loops re-issue the same queries
+_search_cache = TTLCache(maxsize=2048, ttl=900)
+
 class SearchTool:
     """Serper.dev search tool for web search operations"""
 
-    def __init__(self):
+    # Matched against the hostname only, so a blacklisted name in a path or query doesn't count
+    BLACKLIST_RE = re.compile(
+        r'(?:^|\.)(?:youtube\.com|youtu\.be|pinterest\.com|instagram\.com'
+        r'|facebook\.com|twitter\.com|tiktok\.com|reddit\.com)$',
+        re.IGNORECASE
+    )
+
+    def __init__(self, session: Optional[requests.Session] = None):
         self.api_key = os.getenv("SERP_API_KEY")
         if not self.api_key:
             raise ValueError("SERP_API_KEY not found in environment variables")
 
+        # Headers are set once on the session rather than rebuilt per search
+        self.session = session or _serper_session
+        self.session.headers.update({
+            'X-API-KEY': self.api_key,
+            'Content-Type': 'application/json'
+        })
+
     def search(self, query: str, num_results: int = 10) -> List[Dict]:
         """
         Search Google using Serper API
         Returns list of search results with title, link, snippet
         """
+        # Queries differing only in case or spacing share an entry
+        cache_key = (" ".join(query.lower().split()), num_results)
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         url = "https://google.serper.dev/search"
         payload = json.dumps({
             "q": query,
             "num": num_results
         })
-        headers = {
-            'X-API-KEY': self.api_key,
-            'Content-Type': 'application/json'
-        }
 
         try:
-            response = requests.post(url, headers=headers, data=payload)
+            response = self.session.post(url, data=payload)
             response.raise_for_status()
 
             data = response.json()
@@ -46,7 +73,8 @@ class SearchTool:
                         'position': result.get('position', 0)
                     })
 
-            return results
+            _search_cache.set(cache_key, results)
+            return list(results)
 
         except Exception as e:
             print(f"Error in search: {e}")
@@ -57,17 +85,12 @@ class SearchTool:
         Filter out low-quality or blacklisted URLs
         Blacklist: youtube, pinterest, social media, etc.
         """
-        blacklist_domains = [
-            'youtube.com', 'youtu.be', 'pinterest.com', 'instagram.com',
-            'facebook.com', 'twitter.com', 'tiktok.com', 'reddit.com'
-        ]
-
         filtered = []
         for result in results:
-            url = result.get('link', '').lower()
+            host = urlparse(result.get('link', '')).hostname or ''
 
             # Skip if domain is blacklisted
-            if any(domain in url for domain in blacklist_domains):
+            if self.BLACKLIST_RE.search(host):
                 continue
 
             # Skip if no meaningful content
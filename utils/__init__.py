@@ -1,4 +1,15 @@
-from .graph_viz import KnowledgeGraphGenerator
-from .pdf_gen import PDFGenerator
+import importlib
 
-__all__ = ['KnowledgeGraphGenerator', 'PDFGenerator']
\ No newline at end of file
+__all__ = ['KnowledgeGraphGenerator', 'PDFGenerator']
+
+# Exports load on first access, so importing one submodule (e.g. utils.pdf_gen in a PDF worker)
+# does not pull in pyvis and networkx through graph_viz
+_EXPORTS = {
+    'KnowledgeGraphGenerator': '.graph_viz',
+    'PDFGenerator': '.pdf_gen'
+}
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,109 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Insert a value, evicting the least recently used entries past maxsize"""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def items(self) -> List[tuple]:
+        """Snapshot of the (key, value) pairs that have not expired"""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                (key, value) for key, (stored_at, value) in self._data.items()
+                if self.ttl is None or now - stored_at <= self.ttl
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache:
+    """
+    LRU + TTL cache keyed by embedding vectors
+    A lookup hits when a stored vector's cosine similarity reaches the threshold
+    Vectors are kept as int8 by default, a quarter of the float32 footprint
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = 300, threshold: float = 0.97,
+                 quantize: bool = True):
+        self.threshold = threshold
+        self.quantize = quantize
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _encode(self, vector: Sequence[float]) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        unit = vec / norm if norm else vec
+        if not self.quantize:
+            return unit
+        return np.clip(np.rint(unit * 127), -127, 127).astype(np.int8)
+
+    def _scores(self, matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+        if not self.quantize:
+            return matrix @ query
+        # Integer dot product rescaled back to cosine
+        return (matrix.astype(np.int32) @ query.astype(np.int32)) / (127.0 * 127.0)
+
+    def get(self, vector: Sequence[float], scope: Hashable = None, default: Any = None) -> Any:
+        """Return the value stored under the most similar vector in the same scope"""
+        candidates = [(key, entry) for key, entry in self._entries.items() if key[0] == scope]
+        if not candidates:
+            return default
+
+        query = self._encode(vector)
+        matrix = np.stack([entry[0] for _, entry in candidates])
+        scores = self._scores(matrix, query)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return default
+
+        key = candidates[best][0]
+        entry = self._entries.get(key)  # Refresh LRU position
+        return entry[1] if entry is not None else default
+
+    def set(self, vector: Sequence[float], value: Any, scope: Hashable = None) -> None:
+        encoded = self._encode(vector)
+        self._entries.set((scope, encoded.tobytes()), (encoded, value))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,5 +1,7 @@
 import re
+import gzip
 import json
+from collections import OrderedDict
 import networkx as nx
 from pyvis.network import Network
 from typing import List, Dict, Set
@@ -7,6 +9,33 @@ from datetime import datetime
 import tempfile
 import os
 
+# Simple but effective entity extraction patterns, compiled once at import.
+# Patterns stay separate rather than fused into one alternation: the broad
+# acronym pattern matches almost any word under IGNORECASE and would shadow
+# the more specific ones at the same position.
+ENTITY_PATTERNS = {
+    'technologies': [
+        re.compile(r'\b([A-Z][a-z]*[0-9]*\s*(?:Chip|Processor|Architecture|Technology|Battery|Protocol))\b', re.IGNORECASE),
+        re.compile(r'\b([A-Z]{2,}[0-9]*(?:\s+)*[A-Z]*[0-9]*)\b', re.IGNORECASE),  # M4, SSD, etc.
+        re.compile(r'\b(?:\w+\s+)*(?:Technology|System|Device|Component)\b', re.IGNORECASE)
+    ],
+    'organizations': [
+        re.compile(r'\b([A-Z][a-zA-Z]*(?:\s+[A-Z][a-zA-Z]*)*\s*(?:Inc|Corp|Company|Labs|Research|University))\b', re.IGNORECASE),
+        re.compile(r'\b(?:Apple|Google|Microsoft|Intel|AMD|NVIDIA|Toyota|QuantumScape|Tesla)\b', re.IGNORECASE)
+    ],
+    'concepts': [
+        re.compile(r'\b(?:Solid State|Lithium Ion|Quantum Computing|Machine Learning|AI|Neural Network)\b', re.IGNORECASE),
+        re.compile(r'\b(?:Breakthrough|Innovation|Revolutionary|Advanced|Next Generation)\b', re.IGNORECASE)
+    ]
+}
+
+# Entities occurring within this many characters of each other are linked
+CO_OCCURRENCE_WINDOW = 1000
+
+# Two or more capitalised words; every character belongs to exactly one part of the
+# pattern, so a failed match never re-partitions the same run of text
+KEY_PHRASE_PATTERN = re.compile(r'\b[A-Z][a-z]*(?:\s*[A-Z][a-z]*)+\b')
+
 class KnowledgeGraphGenerator:
     """Generate interactive knowledge graphs from research reports"""
 
@@ -19,23 +48,6 @@ class KnowledgeGraphGenerator:
         Extract key entities from research report
         Returns dict with categories: technologies, organizations, people, concepts
         """
-        # Simple but effective entity extraction patterns
-        entity_patterns = {
-            'technologies': [
-                r'\b([A-Z][a-z]*[0-9]*\s*(?:Chip|Processor|Architecture|Technology|Battery|Protocol))\b',
-                r'\b([A-Z]{2,}[0-9]*(?:\s+)*[A-Z]*[0-9]*)\b',  # M4, SSD, etc.
-                r'\b(?:\w+\s+)*(?:Technology|System|Device|Component)\b'
-            ],
-            'organizations': [
-                r'\b([A-Z][a-zA-Z]*(?:\s+[A-Z][a-zA-Z]*)*\s*(?:Inc|Corp|Company|Labs|Research|University))\b',
-                r'\b(?:Apple|Google|Microsoft|Intel|AMD|NVIDIA|Toyota|QuantumScape|Tesla)\b'
-            ],
-            'concepts': [
-                r'\b(?:Solid State|Lithium Ion|Quantum Computing|Machine Learning|AI|Neural Network)\b',
-                r'\b(?:Breakthrough|Innovation|Revolutionary|Advanced|Next Generation)\b'
-            ]
-        }
-
         entities = {
             'technologies': set(),
             'organizations': set(),
@@ -44,18 +56,17 @@ class KnowledgeGraphGenerator:
         }
 
         # Extract with patterns
-        for category, patterns in entity_patterns.items():
+        for category, patterns in ENTITY_PATTERNS.items():
             for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        match = match[0]
+                # Each pattern's capture group spans the whole match, so group 0 is always the entity
+                for m in pattern.finditer(text):
+                    match = m.group()
                     if len(match) > 3:  # Filter very short matches
                         entities[category].add(match.strip())
 
         # Extract key phrases (capitalized words)
-        key_phrases = re.findall(r'\b(?:[A-Z][a-z]*\s*){2,}\b', text)
-        entities['keywords'].update([phrase.strip() for phrase in key_phrases if 10 > len(phrase) > 4])
+        key_phrases = KEY_PHRASE_PATTERN.findall(text)
+        entities['keywords'].update([phrase for phrase in key_phrases if 10 > len(phrase) > 4])
 
         # Convert sets to sorted lists
         return {k: sorted(list(v)) for k, v in entities.items()}
@@ -87,22 +98,41 @@ class KnowledgeGraphGenerator:
         for category, items in entities.items():
             entity_list.extend(items[:10])
 
-        # Simple co-occurrence analysis
-        for i, entity1 in enumerate(entity_list):
-            for j, entity2 in enumerate(entity_list[i+1:], i+1):
-                if entity1 in text and entity2 in text:
-                    # Calculate rough proximity (simple distance measure)
-                    pos1 = text.find(entity1)
-                    pos2 = text.find(entity2)
-                    if abs(pos1 - pos2) < 1000:  # Within ~1000 characters
-                        G.add_edge(entity1, entity2, weight=1.0)
+        # The same string can appear in several categories; scan the text for it once
+        entity_list = list(dict.fromkeys(entity_list))
+
+        # Every occurrence of every entity, each found by a C-level str.find scan
+        hits = []
+        for entity in entity_list:
+            pos = text.find(entity)
+            while pos != -1:
+                hits.append((pos, entity))
+                pos = text.find(entity, pos + 1)
+        hits.sort()
+
+        # Sweep the occurrences in order, linking entities seen within the window
+        recent = OrderedDict()  # entity -> last position, oldest first
+        for pos, entity in hits:
+            while recent:
+                oldest, oldest_pos = next(iter(recent.items()))
+                if pos - oldest_pos < CO_OCCURRENCE_WINDOW:
+                    break
+                recent.popitem(last=False)
+
+            for other in recent:
+                if other != entity:
+                    G.add_edge(entity, other, weight=1.0)
+
+            recent[entity] = pos
+            recent.move_to_end(entity)
 
         return G
 
-    def generate_interactive_graph(self, report_text: str, session_id: str) -> str:
+    def generate_interactive_graph(self, report_text: str, session_id: str, compress: bool = False) -> str:
         """
         Generate an interactive HTML graph from research report
         Returns path to the generated HTML file
+        With compress=True the file is gzipped (.html.gz) for servers that send Content-Encoding: gzip
         """
         print("🕸️ Generating interactive knowledge graph")
 
@@ -119,7 +149,8 @@ class KnowledgeGraphGenerator:
             width="100%",
             bgcolor="#ffffff",
             font_color="#333333",
-            notebook=False
+            notebook=False,
+            cdn_resources="remote"
         )
 
         # Transfer nodes and edges
@@ -153,10 +184,8 @@ class KnowledgeGraphGenerator:
         }
         """)
 
-        # Add title and legend
-        html_content = f"""
-        <html>
-        <head>
+        # Title and styles go into pyvis's <head>, header and legend at the top of its <body>
+        head_html = f"""
             <title>Research Knowledge Graph - Session {session_id}</title>
             <style>
                 body {{ font-family: Arial, sans-serif; margin: 20px; }}
@@ -185,8 +214,9 @@ class KnowledgeGraphGenerator:
                     border-radius: 5px;
                 }}
             </style>
-        </head>
-        <body>
+        """
+
+        body_html = """
             <div class="header">
                 <h2>Research Knowledge Graph</h2>
                 <p>Interactive visualization of key concepts and entities from your research</p>
@@ -216,19 +246,19 @@ class KnowledgeGraphGenerator:
         filename = f"knowledge_graph_{session_id}.html"
         filepath = os.path.join(self.temp_dir, filename)
 
-        # Combine with network HTML
+        # Inject into pyvis's full document with one replace each; its head scripts stay intact
         net_html = net.generate_html()
+        net_html = net_html.replace('</head>', head_html + '</head>', 1)
+        net_html = net_html.replace('<body>', '<body>' + body_html, 1)
 
-        # Extract just the network part (skip the head/body tags)
-        net_content = net_html[net_html.find('<div id="mynetwork"'):net_html.rfind('</script>') + 9]
-
-        final_html = f"""{html_content}
-            {net_content}
-        </body>
-        </html>"""
+        if compress:
+            filepath += ".gz"
+            output = gzip.open(filepath, 'wt', encoding='utf-8', compresslevel=6)
+        else:
+            output = open(filepath, 'w', encoding='utf-8')
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(final_html)
+        with output as f:
+            f.write(net_html)
 
         print(f"🎯 Knowledge graph saved: {filepath}")
         return filepath
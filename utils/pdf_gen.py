@@ -1,25 +1,289 @@
+import io
 import os
-import markdown2
-from xhtml2pdf import pisa
+import atexit
+import logging
+import logging.handlers
+import html
+import re
+import shutil
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import cache
+from importlib import resources
 from datetime import datetime
 import tempfile
-from typing import Optional
+from typing import IO, BinaryIO, Iterable, Iterator, List, Optional
+
+# Module logger printing bare messages to stdout like the rest of the app; PDF worker
+# processes forward their records here through a queue instead of writing stdout themselves
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _stdout_handler = logging.StreamHandler()
+    _stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_stdout_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# PDF engines and the markdown parser are imported on first use, so importing this module
+# (and every PDF worker process) only pays for the engine it actually renders with
+@cache
+def _load_engine(name: str):
+    """Import a PDF engine module; None if it or its system libraries are unavailable"""
+    try:
+        if name == "weasyprint":
+            import weasyprint
+            return weasyprint
+        if name == "pdfkit":
+            import pdfkit
+            return pdfkit
+        if name == "xhtml2pdf":
+            from xhtml2pdf import pisa
+            return pisa
+    except (ImportError, OSError):  # OSError when WeasyPrint's Pango/Cairo libraries are missing
+        return None
+    return None
+
+
+def _engine(name: str):
+    module = _load_engine(name)
+    if module is None:
+        raise RuntimeError(f"PDF backend '{name}' is not installed")
+    return module
+
+
+# PDFs are written under this suffix and renamed when complete, so readers never see a partial file
+PART_SUFFIX = ".part"
+
+
+def _render_weasyprint(html_bytes: bytes, pdf_file: BinaryIO) -> None:
+    _engine("weasyprint").HTML(file_obj=io.BytesIO(html_bytes), encoding='utf-8').write_pdf(pdf_file)
+
+def _render_pdfkit(html_bytes: bytes, pdf_file: BinaryIO) -> None:
+    # pdfkit only takes text and re-encodes it for wkhtmltopdf; output_path=False returns the PDF bytes
+    pdf_file.write(_engine("pdfkit").from_string(html_bytes.decode('utf-8'), False, options={"encoding": "UTF-8", "quiet": ""}))
+
+def _render_xhtml2pdf(html_bytes: bytes, pdf_file: BinaryIO) -> None:
+    pisa_status = _engine("xhtml2pdf").CreatePDF(
+        html_bytes,
+        dest=pdf_file,
+        encoding='utf-8'
+    )
+    if pisa_status.err:
+        raise RuntimeError(f"xhtml2pdf reported {pisa_status.err} error(s)")
+
+# xhtml2pdf lays out tables quadratically, so for that engine they are rewritten as plain block rows
+_TABLE_TAG_RE = re.compile(r"<(/?)(table|thead|tbody|tr|th|td)\b[^>]*>", re.IGNORECASE)
+_TABLE_TAG_OPEN = {
+    "table": '<div class="table">',
+    "thead": "",
+    "tbody": "",
+    "tr": '<div class="row">',
+    "th": '<span class="cell cell-head">',
+    "td": '<span class="cell">'
+}
+_TABLE_TAG_CLOSE = {
+    "table": "</div>",
+    "thead": "",
+    "tbody": "",
+    "tr": "</div>",
+    "th": "</span> ",
+    "td": "</span> "
+}
+
+
+def flatten_tables(html_content: str) -> str:
+    """Replace table markup with div rows and span cells in a single regex pass"""
+    def replace(match):
+        tags = _TABLE_TAG_CLOSE if match.group(1) else _TABLE_TAG_OPEN
+        return tags[match.group(2).lower()]
+
+    return _TABLE_TAG_RE.sub(replace, html_content)
+
+PDF_BACKENDS = {
+    "weasyprint": _render_weasyprint,
+    "pdfkit": _render_pdfkit,
+    "xhtml2pdf": _render_xhtml2pdf
+}
+
+
+def default_backend() -> str:
+    """Fastest engine that is installed: WeasyPrint, then wkhtmltopdf via pdfkit, then xhtml2pdf"""
+    if _load_engine("weasyprint") is not None:
+        return "weasyprint"
+    if shutil.which("wkhtmltopdf") and _load_engine("pdfkit") is not None:
+        return "pdfkit"
+    return "xhtml2pdf"
+
+
+# Stylesheet shared by every report, read once at import
+_STYLE = resources.files(__package__).joinpath("report.css").read_text(encoding="utf-8")
+
+# Document shell built once and split around the title and body, the only parts that vary per report
+_SHELL_OPEN = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>"""
+_SHELL_BODY_OPEN = """</title>
+    <style>""" + _STYLE + """</style>
+</head>
+<body>
+"""
+_SHELL_CLOSE = """
+</body>
+</html>
+"""
+
+# The same pieces pre-encoded, since the PDF engines are fed UTF-8 bytes
+_SHELL_OPEN_BYTES = _SHELL_OPEN.encode('utf-8')
+_SHELL_BODY_OPEN_BYTES = _SHELL_BODY_OPEN.encode('utf-8')
+_SHELL_CLOSE_BYTES = _SHELL_CLOSE.encode('utf-8')
+
+
+@cache
+def _parser(include_toc: bool):
+    """
+    Markdown parser shared by all reports; parsing keeps no state between calls, so it is safe to share
+    GFM tables and strikethrough; heading ids cost an extra pass, so only the TOC parser adds them
+    """
+    from markdown_it import MarkdownIt
+
+    md = MarkdownIt("commonmark").enable(["table", "strikethrough"])
+    if include_toc:
+        from mdit_py_plugins.anchors import anchors_plugin
+        md.use(anchors_plugin, max_level=6)
+    return md
+
+
+# Deepest heading level listed in a table of contents
+TOC_MAX_LEVEL = 3
+
+
+def _toc_html(tokens: list) -> str:
+    """Table of contents linking to the anchored headings in a token stream"""
+    items = []
+    for i, token in enumerate(tokens):
+        level = int(token.tag[1:]) if token.type == "heading_open" else 0
+        if 1 < level <= TOC_MAX_LEVEL:  # The h1 is the report title
+            # Plain heading text, without emphasis or link markup
+            text = "".join(child.content for child in tokens[i + 1].children if child.type in ("text", "code_inline"))
+            items.append(f'<li class="toc-h{level}"><a href="#{token.attrs["id"]}">{html.escape(text)}</a></li>')
+    if not items:
+        return ""
+    return '<div class="toc">\n<h2>Contents</h2>\n<ul>\n' + "\n".join(items) + "\n</ul>\n</div>\n"
+
+
+# Rough rendered size of one PDF page, used to split long reports
+CHARS_PER_PAGE = 2000
+
+
+# Reference-style link definition, e.g. "[r]: https://example.com"
+_LINK_DEFINITION_RE = re.compile(r" {0,3}\[[^\]]+\]:\s*\S")
+
+
+def split_markdown_sections(markdown_content: str, max_chars: int) -> List[str]:
+    """
+    Split markdown at "## " headings into chunks of at most max_chars where possible
+    Headings inside fenced code are ignored; a single oversized section becomes its own chunk
+    Reference-style link definitions are copied into every chunk so links resolve in each part
+    """
+    sections, current, definitions, in_fence = [], [], [], False
+    for line in markdown_content.splitlines(keepends=True):
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        if not in_fence and _LINK_DEFINITION_RE.match(line):
+            definitions.append(line if line.endswith("\n") else line + "\n")
+            continue
+        if not in_fence and line.startswith("## ") and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+
+    chunks, chunk, size = [], [], 0
+    for section in sections:
+        if chunk and size + len(section) > max_chars:
+            chunks.append("".join(chunk))
+            chunk, size = [], 0
+        chunk.append(section)
+        size += len(section)
+    if chunk:
+        chunks.append("".join(chunk))
+
+    if len(chunks) <= 1:
+        return [markdown_content]
+
+    references = "\n" + "".join(definitions) if definitions else ""
+    return [chunk + references for chunk in chunks]
+
 
 class PDFGenerator:
     """Generate PDF reports from markdown content"""
 
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None):
         self.temp_dir = "temp"
         os.makedirs(self.temp_dir, exist_ok=True)
 
-    def markdown_to_html(self, markdown_content: str, title: str = "Research Report") -> str:
+        self._backend = backend or os.getenv("PDF_BACKEND")
+        if self._backend is not None and self._backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend '{self._backend}', expected one of {list(PDF_BACKENDS)}")
+
+    @property
+    def backend(self) -> str:
+        """Engine name; when not configured, picked on first use so probing the engines stays lazy"""
+        if self._backend is None:
+            self._backend = default_backend()
+        return self._backend
+
+    def markdown_to_html(self, markdown_content: str, title: str = "Research Report",
+                         include_toc: bool = False) -> str:
         """Convert markdown to HTML with styling"""
+        out = io.StringIO()
+        self.write_html(out, markdown_content, title, include_toc)
+        return out.getvalue()
+
+    def write_html(self, out: IO[str], markdown_content: str, title: str = "Research Report",
+                   include_toc: bool = False) -> None:
+        """
+        Write the styled HTML document to a text stream
+        The body is rendered one top-level block at a time, so no full-size body string is built
+        """
+        out.write(_SHELL_OPEN)
+        out.write(html.escape(title))
+        out.write(_SHELL_BODY_OPEN)
+        for block in self._render_blocks(markdown_content, title, include_toc):
+            out.write(block)
+        out.write(_SHELL_CLOSE)
+
+    def markdown_to_html_bytes(self, markdown_content: str, title: str = "Research Report",
+                               include_toc: bool = False) -> bytes:
+        """UTF-8 document for the PDF engine; only the title and body are encoded per call"""
+        return self._document_bytes(self._render_blocks(markdown_content, title, include_toc), title)
+
+    def _document_bytes(self, blocks: Iterable[str], title: str) -> bytes:
+        """Wrap HTML body blocks in the pre-encoded shell"""
+        parts = [_SHELL_OPEN_BYTES, html.escape(title).encode('utf-8'), _SHELL_BODY_OPEN_BYTES]
+        for block in blocks:
+            if self.backend == "xhtml2pdf":
+                block = flatten_tables(block)
+            parts.append(block.encode('utf-8'))
+        parts.append(_SHELL_CLOSE_BYTES)
+        return b"".join(parts)
+
+    def _render_blocks(self, markdown_content: str, title: str, include_toc: bool = False,
+                       generated_at: Optional[datetime] = None) -> Iterator[str]:
+        """
+        Yield the report body as HTML, one top-level block at a time
+        With include_toc, headings get ids and a linked contents list follows the metadata header
+        """
 
         # Add header with metadata
         header = f"""
 # {title}
 
-**Generated on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**Generated on:** {(generated_at or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')}
 **Research Session:** Technical Analysis
 
 ---
@@ -28,182 +292,201 @@ class PDFGenerator:
 
         full_content = header + markdown_content
 
-        # Convert to HTML with extras
-        html_content = markdown2.markdown(
-            full_content,
-            extras=[
-                'fenced-code-blocks',
-                'tables',
-                'header-ids',
-                'toc',
-                'code-friendly'
-            ]
-        )
-
-        # Add CSS styling for the PDF
-        styled_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>{title}</title>
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                h1 {{
-                    color: #2c3e50;
-                    border-bottom: 3px solid #3498db;
-                    padding-bottom: 10px;
-                    margin-bottom: 20px;
-                }}
-                h2 {{
-                    color: #34495e;
-                    border-bottom: 2px solid #ecf0f1;
-                    padding-bottom: 5px;
-                    margin-top: 30px;
-                }}
-                h3 {{
-                    color: #7f8c8d;
-                    margin-top: 25px;
-                }}
-                code {{
-                    background-color: #f8f9fa;
-                    padding: 2px 4px;
-                    border-radius: 3px;
-                    font-family: 'Courier New', monospace;
-                    font-size: 0.9em;
-                }}
-                pre {{
-                    background-color: #f8f9fa;
-                    padding: 15px;
-                    border-radius: 5px;
-                    overflow-x: auto;
-                    border-left: 4px solid #3498db;
-                }}
-                blockquote {{
-                    border-left: 4px solid #3498db;
-                    margin: 20px 0;
-                    padding-left: 20px;
-                    font-style: italic;
-                    color: #555;
-                }}
-                table {{
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin: 20px 0;
-                }}
-                th, td {{
-                    border: 1px solid #ddd;
-                    padding: 12px;
-                    text-align: left;
-                }}
-                th {{
-                    background-color: #f8f9fa;
-                    font-weight: bold;
-                }}
-                .source {{
-                    font-size: 0.9em;
-                    color: #666;
-                    background-color: #f8f9fa;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                    margin: 5px 0;
-                }}
-                .metadata {{
-                    background-color: #ecf0f1;
-                    padding: 15px;
-                    border-radius: 5px;
-                    margin-bottom: 20px;
-                    font-size: 0.9em;
-                }}
-                p {{
-                    margin: 10px 0;
-                    text-align: justify;
-                }}
-                ul, ol {{
-                    margin: 10px 0;
-                    padding-left: 25px;
-                }}
-                li {{
-                    margin: 5px 0;
-                }}
-            </style>
-        </head>
-        <body>
-            {html_content}
-        </body>
-        </html>
-        """
+        md = _parser(include_toc)
+        env = {}
+        tokens = md.parse(full_content, env)
+        toc = _toc_html(tokens) if include_toc else ""
 
-        return styled_html
+        start = 0
+        for i, token in enumerate(tokens):
+            # A top-level block ends at its closing token, or is a single token (fence, hr, html)
+            if token.level == 0 and token.nesting <= 0:
+                yield md.renderer.render(tokens[start:i + 1], md.options, env)
+                start = i + 1
+                # The first rule closes the metadata header
+                if toc and token.type == "hr":
+                    yield toc
+                    toc = ""
 
-    def generate_pdf(self, markdown_content: str, session_id: str, title: str = "Research Report") -> Optional[str]:
+    def generate_pdf(self, markdown_content: str, session_id: str, title: str = "Research Report",
+                     include_toc: bool = False, generated_at: Optional[datetime] = None) -> Optional[str]:
         """
         Generate a PDF from markdown content
         Returns the path to the generated PDF file
+        generated_at stamps both the header and the file name; defaults to now
+        """
+        generated_at = generated_at or datetime.now()
+        blocks = self._render_blocks(markdown_content, title, include_toc, generated_at)
+        return self._generate(blocks, session_id, title, generated_at)
+
+    def generate_pdf_from_html(self, html_body: str, session_id: str, title: str = "Research Report") -> Optional[str]:
         """
-        print("📄 Generating PDF report")
+        Generate a PDF from an already rendered HTML body, skipping markdown parsing
+        The body is wrapped in the report shell and stylesheet; no title header is added
+        """
+        return self._generate([html_body], session_id, title, datetime.now())
+
+    def _generate(self, blocks: Iterable[str], session_id: str, title: str, generated_at: datetime) -> Optional[str]:
+        """Render body blocks to a PDF file; blocks may be lazy, so markdown errors are caught here too"""
+        logger.info("📄 Generating PDF report")
 
         try:
             # Convert to HTML
-            html_content = self.markdown_to_html(markdown_content, title)
-
-            # Generate filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"research_report_{session_id}_{timestamp}.pdf"
-            filepath = os.path.join(self.temp_dir, filename)
-
-            # Create PDF
-            with open(filepath, 'w+b') as pdf_file:
-                # Convert HTML to PDF
-                pisa_status = pisa.CreatePDF(
-                    html_content,
-                    dest=pdf_file,
-                    encoding='utf-8'
-                )
-
-                if pisa_status.err:
-                    print(f"❌ Error generating PDF: {pisa_status.err}")
-                    return None
-
-            print(f"✅ PDF generated successfully: {filepath}")
+            html_bytes = self._document_bytes(blocks, title)
+
+            # Engines emit many small writes; collect them in memory so the file gets one write
+            pdf_buffer = io.BytesIO()
+            PDF_BACKENDS[self.backend](html_bytes, pdf_buffer)
+
+            # Unique name created atomically; the .part file is renamed once complete
+            timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
+            fd, part_path = tempfile.mkstemp(
+                prefix=f"research_report_{session_id}_{timestamp}_",
+                suffix=".pdf" + PART_SUFFIX,
+                dir=self.temp_dir
+            )
+            try:
+                with os.fdopen(fd, 'wb') as pdf_file:
+                    pdf_file.write(pdf_buffer.getbuffer())
+                filepath = part_path[:-len(PART_SUFFIX)]
+                os.replace(part_path, filepath)
+            except BaseException:
+                os.unlink(part_path)
+                raise
+
+            logger.info(f"✅ PDF generated successfully: {filepath}")
             return filepath
 
         except Exception as e:
-            print(f"❌ Exception generating PDF: {e}")
+            logger.error(f"❌ Exception generating PDF with {self.backend}: {e}")
             return None
 
+    def generate_paginated_pdf(self, markdown_content: str, session_id: str, title: str = "Research Report",
+                               max_pages_per_pdf: int = 50, include_toc: bool = False) -> List[str]:
+        """
+        Generate one or more PDFs, splitting long reports at "## " sections
+        Each part stays under roughly max_pages_per_pdf pages, bounding the engine's per-document layout work
+        Returns the paths of the generated parts in order; parts that fail are skipped
+        """
+        generated_at = datetime.now()
+        paths = [
+            self.generate_pdf(part, part_session, part_title, include_toc, generated_at)
+            for part, part_session, part_title in _paginate(markdown_content, session_id, title, max_pages_per_pdf)
+        ]
+        return [path for path in paths if path]
+
+    def submit_paginated_pdf(self, markdown_content: str, session_id: str, title: str = "Research Report",
+                             max_pages_per_pdf: int = 50, include_toc: bool = False) -> "List[Future[Optional[str]]]":
+        """
+        Paginated generation in the worker pool; returns one Future per part, in order
+        Parts render in parallel; a Future resolves to None if its part fails
+        """
+        generated_at = datetime.now()
+        return [
+            self.submit_pdf(part, part_session, part_title, include_toc, generated_at)
+            for part, part_session, part_title in _paginate(markdown_content, session_id, title, max_pages_per_pdf)
+        ]
+
+    def submit_pdf(self, markdown_content: str, session_id: str, title: str = "Research Report",
+                   include_toc: bool = False, generated_at: Optional[datetime] = None) -> "Future[Optional[str]]":
+        """
+        Generate a PDF in a worker process
+        Returns a Future resolving to the same value as generate_pdf, so several reports render in parallel
+        """
+        return _get_pdf_pool().submit(
+            _generate_pdf_worker, self.backend, markdown_content, session_id, title, include_toc, generated_at
+        )
+
     def generate_entity_report(self, entities: dict, session_id: str) -> Optional[str]:
         """Generate a supplementary PDF with entity analysis"""
-        markdown_content = f"""
+        now = datetime.now()
+        return self.generate_pdf(_entity_markdown(entities, now), session_id + "_entities",
+                                 "Entity Analysis Report", generated_at=now)
+
+    def submit_entity_report(self, entities: dict, session_id: str) -> "Future[Optional[str]]":
+        """Generate the entity analysis PDF in a worker process"""
+        now = datetime.now()
+        return self.submit_pdf(_entity_markdown(entities, now), session_id + "_entities",
+                               "Entity Analysis Report", generated_at=now)
+
+
+def _paginate(markdown_content: str, session_id: str, title: str, max_pages_per_pdf: int) -> List[tuple]:
+    """(markdown, session id, title) for each part; a report that fits in one part keeps its name and title"""
+    parts = split_markdown_sections(markdown_content, max_pages_per_pdf * CHARS_PER_PAGE)
+    if len(parts) == 1:
+        return [(markdown_content, session_id, title)]
+    return [
+        (part, f"{session_id}_part{number}", f"{title} (Part {number} of {len(parts)})")
+        for number, part in enumerate(parts, 1)
+    ]
+
+
+def _entity_markdown(entities: dict, generated_at: datetime) -> str:
+    """Markdown body of the entity analysis report"""
+    parts = [f"""
 # Entity Analysis Report
 
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**Generated:** {generated_at.strftime('%Y-%m-%d %H:%M:%S')}
 
 ## Summary of Discovered Entities
 
 This report provides a structured analysis of the key entities identified during the research process.
 
-"""
+"""]
+
+    for category, items in entities.items():
+        if items:
+            parts.append(f"## {category.title()}\n\n")
+            parts.extend(f"- {item}\n" for item in items)
+            parts.append(f"\n*Total {category}: {len(items)} entities*\n\n")
 
-        for category, items in entities.items():
-            if items:
-                markdown_content += f"## {category.title()}\n\n"
-                for item in items[:20]:  # Top 20 per category
-                    markdown_content += f"- {item}\n"
-                markdown_content += f"\n*Total {category}: {len(items)} entities*\n\n"
+    return "".join(parts)
 
-        return self.generate_pdf(markdown_content, session_id + "_entities", "Entity Analysis Report")
+
+# PDF layout is CPU-bound and holds the GIL, so concurrent reports render in separate processes
+MAX_PDF_WORKERS = min(4, os.cpu_count() or 1)
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Create the worker pool on first use; spawn avoids forking the app's threads and open clients"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            context = multiprocessing.get_context("spawn")
+
+            # Worker log records come back over a queue and go out through this process's handlers
+            log_queue = context.Queue()
+            listener = logging.handlers.QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=MAX_PDF_WORKERS,
+                mp_context=context,
+                initializer=_init_pdf_worker,
+                initargs=(log_queue, logger.level)
+            )
+        return _pdf_pool
+
+
+def _init_pdf_worker(log_queue, level: int) -> None:
+    """Route the worker's PDF log records to the parent process"""
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def _generate_pdf_worker(backend: str, markdown_content: str, session_id: str, title: str,
+                         include_toc: bool, generated_at: Optional[datetime]) -> Optional[str]:
+    """Process pool entry point; must stay at module level to be picklable"""
+    return PDFGenerator(backend).generate_pdf(markdown_content, session_id, title, include_toc, generated_at)
 
 def cleanup_temp_files(hours_old: int = 24):
     """Clean up old temporary files"""
-    import glob
     import time
 
     temp_dir = "temp"
@@ -213,10 +496,14 @@ def cleanup_temp_files(hours_old: int = 24):
     current_time = time.time()
     cutoff_time = current_time - (hours_old * 3600)
 
-    for file_path in glob.glob(os.path.join(temp_dir, "*.pdf")):
-        try:
-            if os.path.getmtime(file_path) < cutoff_time:
-                os.remove(file_path)
-                print(f"🗑️  Removed old temp file: {file_path}")
-        except Exception as e:
-            print(f"⚠️  Could not remove {file_path}: {e}")
\ No newline at end of file
+    # scandir entries carry the name and cache their stat, so each file costs one stat and one unlink
+    with os.scandir(temp_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith((".pdf", ".pdf" + PART_SUFFIX)):
+                continue
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff_time:
+                    os.unlink(entry.path)
+                    logger.info(f"🗑️  Removed old temp file: {entry.path}")
+            except Exception as e:
+                logger.warning(f"⚠️  Could not remove {entry.path}: {e}")
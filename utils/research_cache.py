@@ -0,0 +1,62 @@
+import os
+import time
+import shelve
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+class ResearchCache:
+    """
+    Disk-backed cache of finished research runs keyed by the normalized query
+    Each entry keeps the report, its metadata and the scraped chunks so the
+    vector store can be repopulated for follow-up chat without re-scraping
+    """
+
+    def __init__(self, cache_dir: str = os.path.join("temp", "research_cache"),
+                 ttl: Optional[float] = 7 * 24 * 3600):
+        self.ttl = ttl
+        os.makedirs(cache_dir, exist_ok=True)
+        self._path = os.path.join(cache_dir, "research")
+        self._lock = threading.Lock()  # shelve does not support concurrent writers
+
+    @staticmethod
+    def _key(query: str) -> str:
+        normalized = " ".join(query.lower().split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """Return the cached run for this query, or None if missing or expired"""
+        key = self._key(query)
+        try:
+            with self._lock, shelve.open(self._path) as db:
+                entry = db.get(key)
+                if entry is None:
+                    return None
+                if self.ttl is not None and time.time() - entry["stored_at"] > self.ttl:
+                    del db[key]
+                    return None
+                return entry
+        except Exception as e:
+            print(f"⚠️ Research cache read failed: {e}")
+            return None
+
+    def set(self, query: str, report: str, metadata: Dict[str, Any], docs: List["Document"]) -> None:
+        """Store a successful research run"""
+        entry = {
+            "report": report,
+            "metadata": metadata,
+            "docs": docs,
+            "stored_at": time.time()
+        }
+        try:
+            with self._lock, shelve.open(self._path) as db:
+                db[self._key(query)] = entry
+        except Exception as e:
+            print(f"⚠️ Research cache write failed: {e}")
+
+    def clear(self) -> None:
+        with self._lock, shelve.open(self._path, flag="n"):
+            pass